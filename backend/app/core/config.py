@@ -23,6 +23,12 @@ class Settings(BaseSettings):
     # Image Processing Settings
     SUPPORTED_FORMATS: List[str] = [".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".webp"]
     MAX_IMAGE_DIMENSION: int = 4096
+    MAX_CONCURRENT_JOBS: int = 4  # per worker process
+    REMBG_MODEL: str = "u2net"
+
+    # Live Preview Settings
+    PREVIEW_MAX_DIMENSION: int = 1024
+    PREVIEW_JPEG_QUALITY: int = 80
     
     # Security Settings
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -0,0 +1,103 @@
+import asyncio
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from app.schemas.photo_editing import PreviewParams
+from app.services.live_preview import PreviewCancelled, PreviewRenderer
+
+router = APIRouter()
+
+
+class LatestState:
+    """Holds only the newest preview parameters; older ones are overwritten"""
+
+    def __init__(self):
+        self.version = 0
+        self.params = None
+        self.changed = asyncio.Event()
+
+    def update(self, params: PreviewParams):
+        self.version += 1
+        self.params = params
+        self.changed.set()
+
+    def invalidate(self):
+        """Mark any in-flight render as stale without queueing a new one"""
+        self.version += 1
+
+
+@router.websocket("/preview/{filename}")
+async def live_preview(websocket: WebSocket, filename: str):
+    """
+    Stream downscaled previews of an uploaded image.
+
+    The client sends JSON PreviewParams messages. For each rendered state the
+    server replies with a JSON header ({"seq", "width", "height"}) followed by
+    a binary JPEG frame. Updates that arrive while a render is running
+    supersede it: the running render stops at its next step and only the
+    newest parameters are rendered.
+    """
+    await websocket.accept()
+
+    try:
+        renderer = await run_in_threadpool(PreviewRenderer, filename)
+    except FileNotFoundError:
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Image not found"
+        )
+        return
+    except OSError:
+        # /upload only checks the extension; /info reports these as invalid
+        await websocket.close(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Not a readable image"
+        )
+        return
+
+    state = LatestState()
+
+    async def render_latest():
+        try:
+            while True:
+                await state.changed.wait()
+                state.changed.clear()
+                version, params = state.version, state.params
+
+                try:
+                    frame = await run_in_threadpool(
+                        renderer.render, params, lambda: state.version != version
+                    )
+                except PreviewCancelled:
+                    continue
+                except Exception as e:
+                    # Report this state and keep serving newer ones
+                    await websocket.send_json({"seq": params.seq, "error": str(e)})
+                    continue
+
+                width, height = renderer.size
+                await websocket.send_json(
+                    {"seq": params.seq, "width": width, "height": height}
+                )
+                await websocket.send_bytes(frame)
+        except Exception:
+            # Sending failed; close so the client is not left waiting for frames
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
+    render_task = asyncio.create_task(render_latest())
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except (ValueError, KeyError):
+                # Non-JSON text raises JSONDecodeError, binary frames KeyError
+                await websocket.send_json({"error": "Expected a JSON text message"})
+                continue
+            try:
+                state.update(PreviewParams(**message))
+            except (TypeError, ValidationError) as e:
+                await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        state.invalidate()
+        render_task.cancel()
+        await asyncio.gather(render_task, return_exceptions=True)
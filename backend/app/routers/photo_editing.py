@@ -1,9 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response
 import os
 import uuid
 from app.core.config import settings
 from app.services.image_processor import ImageProcessor
+from app.services.jobs import ProcessingCancelled, get_stats, run_cancellable
 from app.schemas.photo_editing import (
     BrightnessRequest,
     ContrastRequest,
@@ -17,10 +19,32 @@ from app.schemas.photo_editing import (
     RotateRequest,
     FlipRequest,
     ChangeBackgroundRequest,
+    VignetteRequest,
+    ToneCurveRequest,
+    UnsharpMaskRequest,
+    WhiteBalanceRequest,
+    NoiseReductionRequest,
+    ImageInfoBatchRequest,
+    ImageInfoBatchResponse,
 )
 
 router = APIRouter()
 
+# Non-standard status (nginx convention) for work abandoned by the client
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def _process(http_request: Request, operation, *args) -> Response:
+    """Run an ImageProcessor method, abandoning it if the client goes away"""
+    try:
+        result_path = await run_cancellable(
+            http_request,
+            lambda token: operation(ImageProcessor(cancel_token=token), *args),
+        )
+    except ProcessingCancelled:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    return FileResponse(result_path, media_type="image/jpeg")
+
 
 @router.post("/upload")
 async def upload_image(file: UploadFile = File(...)):
@@ -63,164 +87,284 @@ async def upload_image(file: UploadFile = File(...)):
 
 
 @router.post("/change-background")
-async def change_background(request: ChangeBackgroundRequest):
+async def change_background(request: ChangeBackgroundRequest, http_request: Request):
     """
     Change the background of an image
     """
-    processor = ImageProcessor()
-    result_path = await processor.change_background(
-        request.filename, request.background_color
+    return await _process(
+        http_request,
+        ImageProcessor.change_background,
+        request.filename,
+        request.background_color,
     )
-    return FileResponse(result_path, media_type="image/jpeg")
 
 
 @router.post("/brightness")
-async def adjust_brightness(request: BrightnessRequest):
+async def adjust_brightness(request: BrightnessRequest, http_request: Request):
     """
     Adjust image brightness
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.adjust_brightness(
-            request.filename, request.factor
+        return await _process(
+            http_request,
+            ImageProcessor.adjust_brightness,
+            request.filename,
+            request.factor,
         )
-        return FileResponse(result_path, media_type="image/jpeg")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/contrast")
-async def adjust_contrast(request: ContrastRequest):
+async def adjust_contrast(request: ContrastRequest, http_request: Request):
     """
     Adjust image contrast
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.adjust_contrast(request.filename, request.factor)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request,
+            ImageProcessor.adjust_contrast,
+            request.filename,
+            request.factor,
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/saturation")
-async def adjust_saturation(request: SaturationRequest):
+async def adjust_saturation(request: SaturationRequest, http_request: Request):
     """
     Adjust image saturation
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.adjust_saturation(
-            request.filename, request.factor
+        return await _process(
+            http_request,
+            ImageProcessor.adjust_saturation,
+            request.filename,
+            request.factor,
         )
-        return FileResponse(result_path, media_type="image/jpeg")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/blur")
-async def apply_blur(request: BlurRequest):
+async def apply_blur(request: BlurRequest, http_request: Request):
     """
     Apply blur effect to image
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.apply_blur(request.filename, request.radius)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request, ImageProcessor.apply_blur, request.filename, request.radius
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/sharpen")
-async def apply_sharpen(request: SharpenRequest):
+async def apply_sharpen(request: SharpenRequest, http_request: Request):
     """
     Apply sharpening effect to image
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.apply_sharpen(request.filename, request.factor)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request, ImageProcessor.apply_sharpen, request.filename, request.factor
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/grayscale")
-async def convert_grayscale(request: GrayscaleRequest):
+async def convert_grayscale(request: GrayscaleRequest, http_request: Request):
     """
     Convert image to grayscale
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.convert_grayscale(request.filename)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request, ImageProcessor.convert_grayscale, request.filename
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/sepia")
-async def apply_sepia(request: SepiaRequest):
+async def apply_sepia(request: SepiaRequest, http_request: Request):
     """
     Apply sepia effect to image
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.apply_sepia(request.filename)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request, ImageProcessor.apply_sepia, request.filename
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/resize")
-async def resize_image(request: ResizeRequest):
+async def resize_image(request: ResizeRequest, http_request: Request):
     """
     Resize image to specified dimensions
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.resize_image(
-            request.filename, request.width, request.height
+        return await _process(
+            http_request,
+            ImageProcessor.resize_image,
+            request.filename,
+            request.width,
+            request.height,
+            request.mode,
         )
-        return FileResponse(result_path, media_type="image/jpeg")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/crop")
-async def crop_image(request: CropRequest):
+async def crop_image(request: CropRequest, http_request: Request):
     """
     Crop image to specified dimensions
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.crop_image(
-            request.filename, request.x, request.y, request.width, request.height
+        return await _process(
+            http_request,
+            ImageProcessor.crop_image,
+            request.filename,
+            request.x,
+            request.y,
+            request.width,
+            request.height,
         )
-        return FileResponse(result_path, media_type="image/jpeg")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/rotate")
-async def rotate_image(request: RotateRequest):
+async def rotate_image(request: RotateRequest, http_request: Request):
     """
     Rotate image by specified angle
     """
     try:
-        processor = ImageProcessor()
-        result_path = await processor.rotate_image(request.filename, request.angle)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await _process(
+            http_request, ImageProcessor.rotate_image, request.filename, request.angle
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/flip")
-async def flip_image(request: FlipRequest):
+async def flip_image(request: FlipRequest, http_request: Request):
     """
     Flip image horizontally or vertically
     """
+    try:
+        return await _process(
+            http_request, ImageProcessor.flip_image, request.filename, request.direction
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/vignette")
+async def apply_vignette(request: VignetteRequest, http_request: Request):
+    """
+    Darken the corners of an image
+    """
+    try:
+        return await _process(
+            http_request,
+            ImageProcessor.apply_vignette,
+            request.filename,
+            request.strength,
+            request.radius,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/tone-curve")
+async def apply_tone_curve(request: ToneCurveRequest, http_request: Request):
+    """
+    Remap image tones through a curve
+    """
+    try:
+        return await _process(
+            http_request,
+            ImageProcessor.apply_tone_curve,
+            request.filename,
+            request.points,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/unsharp-mask")
+async def apply_unsharp_mask(request: UnsharpMaskRequest, http_request: Request):
+    """
+    Sharpen image edges above a contrast threshold
+    """
+    try:
+        return await _process(
+            http_request,
+            ImageProcessor.apply_unsharp_mask,
+            request.filename,
+            request.radius,
+            request.amount,
+            request.threshold,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/white-balance")
+async def adjust_white_balance(request: WhiteBalanceRequest, http_request: Request):
+    """
+    Adjust image white balance
+    """
+    try:
+        return await _process(
+            http_request,
+            ImageProcessor.adjust_white_balance,
+            request.filename,
+            request.temperature,
+            request.tint,
+            request.auto,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/denoise")
+async def reduce_noise(request: NoiseReductionRequest, http_request: Request):
+    """
+    Reduce image noise while preserving edges
+    """
+    try:
+        return await _process(
+            http_request,
+            ImageProcessor.reduce_noise,
+            request.filename,
+            request.radius,
+            request.strength,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/stats")
+async def processing_stats():
+    """
+    Processing queue counters of the worker process that handled this request
+    """
+    return get_stats()
+
+
+@router.post("/info", response_model=ImageInfoBatchResponse)
+async def get_images_info(request: ImageInfoBatchRequest):
+    """
+    Get header metadata (dimensions, format, EXIF orientation, ICC profile,
+    capture time) for many uploaded images without decoding them
+    """
     try:
         processor = ImageProcessor()
-        result_path = await processor.flip_image(request.filename, request.direction)
-        return FileResponse(result_path, media_type="image/jpeg")
+        return await run_in_threadpool(processor.get_images_info, request.filenames)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
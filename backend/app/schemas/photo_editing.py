@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Literal
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional, Tuple
 
 
 class BrightnessRequest(BaseModel):
@@ -47,6 +47,10 @@ class ResizeRequest(BaseModel):
     filename: str = Field(..., description="Name of the uploaded image file")
     width: int = Field(..., ge=1, le=4096, description="Target width (1 to 4096)")
     height: int = Field(..., ge=1, le=4096, description="Target height (1 to 4096)")
+    mode: Literal["stretch", "fit", "fill"] = Field(
+        "stretch",
+        description="stretch to exact size, fit inside it, or fill and center-crop",
+    )
 
 
 class CropRequest(BaseModel):
@@ -71,6 +75,77 @@ class FlipRequest(BaseModel):
     )
 
 
+class VignetteRequest(BaseModel):
+    filename: str = Field(..., description="Name of the uploaded image file")
+    strength: float = Field(
+        0.5, ge=0.0, le=1.0, description="How dark the corners get (0.0 to 1.0)"
+    )
+    radius: float = Field(
+        0.5, ge=0.0, le=1.0, description="Untouched central radius (0.0 to 1.0)"
+    )
+
+
+class ToneCurveRequest(BaseModel):
+    filename: str = Field(..., description="Name of the uploaded image file")
+    points: List[Tuple[int, int]] = Field(
+        ...,
+        min_length=2,
+        max_length=16,
+        description="(input, output) control points, each value 0 to 255",
+    )
+
+    @field_validator("points")
+    @classmethod
+    def check_points(cls, points):
+        for point in points:
+            if not all(0 <= value <= 255 for value in point):
+                raise ValueError("Curve points must be between 0 and 255")
+        if len({x for x, _ in points}) != len(points):
+            raise ValueError("Curve points must have distinct input values")
+        return points
+
+
+class UnsharpMaskRequest(BaseModel):
+    filename: str = Field(..., description="Name of the uploaded image file")
+    radius: float = Field(2.0, ge=0.1, le=20.0, description="Blur radius (0.1 to 20)")
+    amount: float = Field(
+        1.0, ge=0.0, le=5.0, description="Sharpening strength (0.0 to 5.0)"
+    )
+    threshold: int = Field(
+        3, ge=0, le=255, description="Minimum difference to sharpen (0 to 255)"
+    )
+
+
+class WhiteBalanceRequest(BaseModel):
+    filename: str = Field(..., description="Name of the uploaded image file")
+    temperature: float = Field(
+        0.0, ge=-100, le=100, description="Cool to warm (-100 to 100)"
+    )
+    tint: float = Field(
+        0.0, ge=-100, le=100, description="Green to magenta (-100 to 100)"
+    )
+    auto: bool = Field(False, description="Balance automatically (gray world)")
+
+
+class NoiseReductionRequest(BaseModel):
+    filename: str = Field(..., description="Name of the uploaded image file")
+    radius: int = Field(2, ge=1, le=5, description="Neighbourhood radius (1 to 5)")
+    strength: int = Field(
+        20, ge=1, le=100, description="Largest difference treated as noise (1 to 100)"
+    )
+
+
+class PreviewParams(BaseModel):
+    seq: int = Field(0, description="Client sequence number, echoed with the frame")
+    brightness: float = Field(1.0, ge=0.1, le=3.0)
+    contrast: float = Field(1.0, ge=0.1, le=3.0)
+    saturation: float = Field(1.0, ge=0.0, le=3.0)
+    blur: int = Field(0, ge=0, le=20, description="Blur radius, 0 for none")
+    sharpen: float = Field(1.0, ge=0.1, le=3.0)
+    grayscale: bool = False
+    sepia: bool = False
+
+
 class ImageInfo(BaseModel):
     filename: str
     size: int
@@ -78,6 +153,23 @@ class ImageInfo(BaseModel):
     width: int
     height: int
     format: str
+    mode: str
+    orientation: int = 1
+    has_icc_profile: bool = False
+    captured_at: Optional[str] = None
+    content_hash: str
+
+
+class ImageInfoBatchRequest(BaseModel):
+    filenames: List[str] = Field(
+        ..., min_length=1, max_length=200, description="Uploaded image file names"
+    )
+
+
+class ImageInfoBatchResponse(BaseModel):
+    images: List[ImageInfo]
+    missing: List[str]
+    invalid: List[str]
 
 
 class ProcessingResult(BaseModel):
@@ -1,15 +1,51 @@
-from rembg import remove
+from rembg import new_session, remove
 import os
+import threading
 import time
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
 import numpy as np
 from app.core.config import settings
+from app.services import kernels, metadata, resampler
+from app.services.jobs import CancellationToken
+
+# Rows per kernel call; cancellation is checked between strips
+STRIP_ROWS = 256
+
+_rembg_session = None
+_rembg_session_lock = threading.Lock()
+
+
+def get_rembg_session():
+    """
+    Shared background-removal model, loaded once per process.
+
+    The production server calls this before forking workers so they share
+    the weights copy-on-write.
+    """
+    global _rembg_session
+    if _rembg_session is None:
+        with _rembg_session_lock:
+            if _rembg_session is None:
+                _rembg_session = new_session(settings.REMBG_MODEL)
+    return _rembg_session
 
 
 class ImageProcessor:
-    def __init__(self):
+    def __init__(self, cancel_token: CancellationToken = None):
         self.upload_dir = settings.UPLOAD_DIR
         self.processed_dir = settings.PROCESSED_DIR
+        self.cancel_token = cancel_token
+
+    def _checkpoint(self):
+        """Stop here if the request that started this work was cancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.check()
+
+    def _in_strips(self, height: int, kernel):
+        """Call kernel(rows) for each slice of STRIP_ROWS rows, checkpointing"""
+        for top in range(0, height, STRIP_ROWS):
+            self._checkpoint()
+            kernel(slice(top, min(top + STRIP_ROWS, height)))
 
     def _get_image_path(self, filename: str) -> str:
         """Get the full path of an uploaded image"""
@@ -21,15 +57,53 @@ class ImageProcessor:
         processed_name = f"{name}{suffix}{ext}"
         return os.path.join(self.processed_dir, processed_name)
 
-    def _load_image(self, filename: str) -> Image.Image:
-        """Load an image using PIL"""
+    def _load_image(self, filename: str, draft_size: tuple = None) -> Image.Image:
+        """
+        Load an image using PIL, upright according to its EXIF orientation.
+
+        draft_size is the smallest upright size the caller needs; JPEGs may
+        then be decoded at a reduced scale.
+        """
+        self._checkpoint()
         image_path = self._get_image_path(filename)
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image {filename} not found")
-        return Image.open(image_path)
+
+        image = Image.open(image_path)
+        orientation = metadata.orientation(image)
+        if draft_size is not None:
+            if orientation in metadata.SWAPS_AXES:
+                draft_size = draft_size[::-1]
+            image.draft(image.mode, draft_size)
+        if orientation != 1:
+            image = ImageOps.exif_transpose(image)
+        return image
+
+    def _to_array(self, image: Image.Image) -> np.ndarray:
+        """Decode an image into a writable C-contiguous RGB uint8 array"""
+        return np.ascontiguousarray(np.array(image.convert("RGB"), dtype=np.uint8))
+
+    def _sepia(self, image: Image.Image) -> Image.Image:
+        """Return a sepia-toned copy of an image"""
+        image_array = np.array(image)
+
+        # Sepia transformation matrix
+        sepia_matrix = np.array(
+            [[0.393, 0.769, 0.189], [0.349, 0.686, 0.168], [0.272, 0.534, 0.131]]
+        )
+
+        # Apply sepia effect
+        sepia_image = image_array.dot(sepia_matrix.T)
+        sepia_image /= sepia_image.max()
+        sepia_image = (sepia_image * 255).astype(np.uint8)
+
+        return Image.fromarray(sepia_image)
 
     def _save_image(self, image: Image.Image, output_path: str) -> str:
         """Save an image and return the path"""
+        # Last chance to skip the encode and write nobody will read
+        self._checkpoint()
+
         # Convert to RGB if necessary
         if image.mode in ("RGBA", "LA", "P"):
             image = image.convert("RGB")
@@ -37,7 +111,7 @@ class ImageProcessor:
         image.save(output_path, "JPEG", quality=95)
         return output_path
 
-    async def change_background(self, filename: str, background_color: str) -> str:
+    def change_background(self, filename: str, background_color: str) -> str:
         """Remove old background and apply a new background color"""
         start_time = time.time()
 
@@ -45,7 +119,9 @@ class ImageProcessor:
         image = self._load_image(filename)
 
         # Remove background -> result has transparency
-        image_no_bg = remove(image)  # returns RGBA with transparent bg
+        # returns RGBA with transparent bg
+        image_no_bg = remove(image, session=get_rembg_session())
+        self._checkpoint()
 
         # Create a new background
         background = Image.new("RGBA", image_no_bg.size, background_color)
@@ -64,7 +140,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def adjust_brightness(self, filename: str, factor: float) -> str:
+    def adjust_brightness(self, filename: str, factor: float) -> str:
         """Adjust image brightness"""
         start_time = time.time()
 
@@ -80,7 +156,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def adjust_contrast(self, filename: str, factor: float) -> str:
+    def adjust_contrast(self, filename: str, factor: float) -> str:
         """Adjust image contrast"""
         start_time = time.time()
 
@@ -96,7 +172,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def adjust_saturation(self, filename: str, factor: float) -> str:
+    def adjust_saturation(self, filename: str, factor: float) -> str:
         """Adjust image saturation"""
         start_time = time.time()
 
@@ -112,7 +188,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def apply_blur(self, filename: str, radius: int) -> str:
+    def apply_blur(self, filename: str, radius: int) -> str:
         """Apply blur effect to image"""
         start_time = time.time()
 
@@ -127,7 +203,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def apply_sharpen(self, filename: str, factor: float) -> str:
+    def apply_sharpen(self, filename: str, factor: float) -> str:
         """Apply sharpening effect to image"""
         start_time = time.time()
 
@@ -143,7 +219,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def convert_grayscale(self, filename: str) -> str:
+    def convert_grayscale(self, filename: str) -> str:
         """Convert image to grayscale"""
         start_time = time.time()
 
@@ -158,24 +234,12 @@ class ImageProcessor:
 
         return output_path
 
-    async def apply_sepia(self, filename: str) -> str:
+    def apply_sepia(self, filename: str) -> str:
         """Apply sepia effect to image"""
         start_time = time.time()
 
         image = self._load_image(filename)
-        image_array = np.array(image)
-
-        # Sepia transformation matrix
-        sepia_matrix = np.array(
-            [[0.393, 0.769, 0.189], [0.349, 0.686, 0.168], [0.272, 0.534, 0.131]]
-        )
-
-        # Apply sepia effect
-        sepia_image = image_array.dot(sepia_matrix.T)
-        sepia_image /= sepia_image.max()
-        sepia_image = (sepia_image * 255).astype(np.uint8)
-
-        sepia_pil = Image.fromarray(sepia_image)
+        sepia_pil = self._sepia(image)
 
         output_path = self._get_processed_path(filename, "_sepia")
         self._save_image(sepia_pil, output_path)
@@ -185,14 +249,23 @@ class ImageProcessor:
 
         return output_path
 
-    async def resize_image(self, filename: str, width: int, height: int) -> str:
+    def resize_image(
+        self, filename: str, width: int, height: int, mode: str = "stretch"
+    ) -> str:
         """Resize image to specified dimensions"""
         start_time = time.time()
 
-        image = self._load_image(filename)
-        resized_image = image.resize((width, height), Image.Resampling.LANCZOS)
+        info = self.get_image_info(filename)
+        image = self._load_image(
+            filename,
+            resampler.draft_size((info["width"], info["height"]), width, height, mode),
+        )
+        resized_image = resampler.resize(image, width, height, mode)
 
-        output_path = self._get_processed_path(filename, f"_resize_{width}x{height}")
+        suffix = f"_resize_{width}x{height}"
+        if mode != "stretch":
+            suffix += f"_{mode}"
+        output_path = self._get_processed_path(filename, suffix)
         self._save_image(resized_image, output_path)
 
         processing_time = time.time() - start_time
@@ -200,9 +273,7 @@ class ImageProcessor:
 
         return output_path
 
-    async def crop_image(
-        self, filename: str, x: int, y: int, width: int, height: int
-    ) -> str:
+    def crop_image(self, filename: str, x: int, y: int, width: int, height: int) -> str:
         """Crop image to specified dimensions"""
         start_time = time.time()
 
@@ -219,14 +290,12 @@ class ImageProcessor:
 
         return output_path
 
-    async def rotate_image(self, filename: str, angle: float) -> str:
+    def rotate_image(self, filename: str, angle: float) -> str:
         """Rotate image by specified angle"""
         start_time = time.time()
 
         image = self._load_image(filename)
-        rotated_image = image.rotate(
-            angle, expand=True, resample=Image.Resampling.BICUBIC
-        )
+        rotated_image = resampler.rotate(image, angle)
 
         output_path = self._get_processed_path(filename, f"_rotate_{angle}")
         self._save_image(rotated_image, output_path)
@@ -236,18 +305,12 @@ class ImageProcessor:
 
         return output_path
 
-    async def flip_image(self, filename: str, direction: str) -> str:
+    def flip_image(self, filename: str, direction: str) -> str:
         """Flip image horizontally or vertically"""
         start_time = time.time()
 
         image = self._load_image(filename)
-
-        if direction == "horizontal":
-            flipped_image = image.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
-        elif direction == "vertical":
-            flipped_image = image.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
-        else:
-            raise ValueError("Direction must be 'horizontal' or 'vertical'")
+        flipped_image = resampler.flip(image, direction)
 
         output_path = self._get_processed_path(filename, f"_flip_{direction}")
         self._save_image(flipped_image, output_path)
@@ -257,21 +320,151 @@ class ImageProcessor:
 
         return output_path
 
+    def apply_vignette(self, filename: str, strength: float, radius: float) -> str:
+        """Darken the corners of an image"""
+        start_time = time.time()
+
+        image_array = self._to_array(self._load_image(filename))
+        height = image_array.shape[0]
+        self._in_strips(
+            height,
+            lambda rows: kernels.vignette(
+                image_array[rows], strength, radius, rows.start, height
+            ),
+        )
+
+        output_path = self._get_processed_path(
+            filename, f"_vignette_{strength}_{radius}"
+        )
+        self._save_image(Image.fromarray(image_array), output_path)
+
+        processing_time = time.time() - start_time
+        print(f"Vignette completed in {processing_time:.2f}s")
+
+        return output_path
+
+    def apply_tone_curve(self, filename: str, points: list) -> str:
+        """Remap tones through a curve defined by (input, output) control points"""
+        start_time = time.time()
+
+        image_array = self._to_array(self._load_image(filename))
+        lut = kernels.tone_curve_lut(points)
+        self._in_strips(
+            image_array.shape[0],
+            lambda rows: kernels.apply_lut(image_array[rows], lut),
+        )
+
+        curve_id = "-".join(f"{x}_{y}" for x, y in sorted(points))
+        output_path = self._get_processed_path(filename, f"_curve_{curve_id}")
+        self._save_image(Image.fromarray(image_array), output_path)
+
+        processing_time = time.time() - start_time
+        print(f"Tone curve completed in {processing_time:.2f}s")
+
+        return output_path
+
+    def apply_unsharp_mask(
+        self, filename: str, radius: float, amount: float, threshold: int
+    ) -> str:
+        """Sharpen edges whose contrast exceeds a threshold"""
+        start_time = time.time()
+
+        image = self._load_image(filename).convert("RGB")
+        blurred = self._to_array(image.filter(ImageFilter.GaussianBlur(radius=radius)))
+        image_array = self._to_array(image)
+        self._in_strips(
+            image_array.shape[0],
+            lambda rows: kernels.unsharp_mask(
+                image_array[rows], blurred[rows], amount, threshold
+            ),
+        )
+
+        output_path = self._get_processed_path(
+            filename, f"_unsharp_{radius}_{amount}_{threshold}"
+        )
+        self._save_image(Image.fromarray(image_array), output_path)
+
+        processing_time = time.time() - start_time
+        print(f"Unsharp mask completed in {processing_time:.2f}s")
+
+        return output_path
+
+    def adjust_white_balance(
+        self, filename: str, temperature: float, tint: float, auto: bool = False
+    ) -> str:
+        """Shift color temperature and tint, or balance automatically"""
+        start_time = time.time()
+
+        image_array = self._to_array(self._load_image(filename))
+        if auto:
+            gains = kernels.gray_world_gains(image_array)
+            suffix = "_white_balance_auto"
+        else:
+            gains = kernels.white_balance_gains(temperature, tint)
+            suffix = f"_white_balance_{temperature}_{tint}"
+        self._in_strips(
+            image_array.shape[0],
+            lambda rows: kernels.scale_channels(image_array[rows], gains),
+        )
+
+        output_path = self._get_processed_path(filename, suffix)
+        self._save_image(Image.fromarray(image_array), output_path)
+
+        processing_time = time.time() - start_time
+        print(f"White balance completed in {processing_time:.2f}s")
+
+        return output_path
+
+    def reduce_noise(self, filename: str, radius: int, strength: int) -> str:
+        """Smooth noise while keeping edges sharp"""
+        start_time = time.time()
+
+        image_array = self._to_array(self._load_image(filename))
+        source = image_array.copy()
+        self._in_strips(
+            image_array.shape[0],
+            lambda rows: kernels.sigma_denoise(
+                image_array[rows], source, radius, strength, rows.start
+            ),
+        )
+
+        output_path = self._get_processed_path(
+            filename, f"_denoise_{radius}_{strength}"
+        )
+        self._save_image(Image.fromarray(image_array), output_path)
+
+        processing_time = time.time() - start_time
+        print(f"Noise reduction completed in {processing_time:.2f}s")
+
+        return output_path
+
     def get_image_info(self, filename: str) -> dict:
-        """Get information about an image"""
+        """Get information about an image from its header, without decoding it"""
         image_path = self._get_image_path(filename)
         if not os.path.exists(image_path):
             raise FileNotFoundError(f"Image {filename} not found")
 
-        image = Image.open(image_path)
         file_size = os.path.getsize(image_path)
 
         return {
             "filename": filename,
             "size": file_size,
             "size_mb": round(file_size / (1024 * 1024), 2),
-            "width": image.width,
-            "height": image.height,
-            "format": image.format,
-            "mode": image.mode,
+            **metadata.probe(image_path),
         }
+
+    def get_images_info(self, filenames: list) -> dict:
+        """
+        Get information about many images. Missing files and files that are
+        not readable images are reported separately instead of failing the batch.
+        """
+        images, missing, invalid = [], [], []
+        for filename in filenames:
+            try:
+                images.append(self.get_image_info(filename))
+            except FileNotFoundError:
+                missing.append(filename)
+            except OSError:
+                # Includes PIL.UnidentifiedImageError for undecodable uploads
+                invalid.append(filename)
+        return {"images": images, "missing": missing, "invalid": invalid}
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import threading
+from collections import Counter
+from typing import Callable, TypeVar
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# How often a running job checks whether its client is still connected
+DISCONNECT_POLL_INTERVAL = 0.2
+
+
+class ProcessingCancelled(Exception):
+    """Raised at a checkpoint once the client that requested the work is gone"""
+
+
+class CancellationToken:
+    """Thread-safe flag shared between the request and its worker thread"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Checkpoint: stop the current job if it has been cancelled"""
+        if self.cancelled:
+            raise ProcessingCancelled()
+
+
+_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_JOBS)
+_stats = Counter()
+
+
+def get_stats() -> dict:
+    """
+    Counters for monitoring the processing queue. Slots and counters live in
+    each worker process, so they are reported with the worker's pid.
+    """
+    return {
+        "pid": os.getpid(),
+        "max_concurrent": settings.MAX_CONCURRENT_JOBS,
+        "active": _stats["active"],
+        "waiting": _stats["waiting"],
+        "completed": _stats["completed"],
+        "cancelled": _stats["cancelled"],
+        "failed": _stats["failed"],
+    }
+
+
+async def _cancel_on_disconnect(request: Request, token: CancellationToken):
+    while not token.cancelled:
+        if await request.is_disconnected():
+            token.cancel()
+            return
+        await asyncio.sleep(DISCONNECT_POLL_INTERVAL)
+
+
+async def run_cancellable(
+    request: Request, work: Callable[[CancellationToken], T]
+) -> T:
+    """
+    Run work(token) in the threadpool, holding one of MAX_CONCURRENT_JOBS
+    slots. If the client disconnects the token is cancelled; the work stops
+    at its next checkpoint with ProcessingCancelled and the slot is freed.
+    """
+    token = CancellationToken()
+    watcher = asyncio.create_task(_cancel_on_disconnect(request, token))
+    try:
+        _stats["waiting"] += 1
+        try:
+            await _slots.acquire()
+        finally:
+            _stats["waiting"] -= 1
+
+        try:
+            # The client may have left while the job was queued
+            token.check()
+            _stats["active"] += 1
+            try:
+                result = await run_in_threadpool(work, token)
+            finally:
+                _stats["active"] -= 1
+        finally:
+            _slots.release()
+    except ProcessingCancelled:
+        _stats["cancelled"] += 1
+        raise
+    except asyncio.CancelledError:
+        token.cancel()
+        _stats["cancelled"] += 1
+        raise
+    except Exception:
+        _stats["failed"] += 1
+        raise
+    finally:
+        watcher.cancel()
+
+    _stats["completed"] += 1
+    return result
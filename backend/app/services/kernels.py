@@ -0,0 +1,144 @@
+"""
+Parallel numba kernels for filters Pillow does not provide.
+
+Every kernel works in place on a C-contiguous uint8 array of shape
+(height, width, 3). Signatures are given explicitly so the kernels are
+compiled when this module is imported rather than on the first request, and
+cache=True keeps the machine code on disk (NUMBA_CACHE_DIR) between restarts.
+
+Callers may pass a strip of full rows (image[top:bottom], still contiguous)
+and check for cancellation between strips. Kernels whose result depends on
+the row position take the strip's `top` offset.
+
+Requests run kernels from several threadpool threads at once. numba's default
+workqueue layer aborts the process on concurrent launches, so only the
+thread-safe TBB layer (the tbb package) is accepted.
+"""
+
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Must be set before the first parallel kernel runs
+numba.config.THREADING_LAYER = "safe"
+
+RGB_IMAGE = "uint8[:, :, ::1]"
+
+
+@njit(f"void({RGB_IMAGE}, float32, float32, int32, int32)", parallel=True, cache=True)
+def vignette(image, strength, radius, top, full_height):
+    """
+    Darken pixels towards the corners. `image` holds rows top onwards of an
+    image full_height rows tall.
+    """
+    height, width, channels = image.shape
+    cy = (full_height - 1) / 2.0
+    cx = (width - 1) / 2.0
+    max_dist = np.sqrt(cx * cx + cy * cy)
+    for y in prange(height):
+        dy = (y + top - cy) / max_dist
+        for x in range(width):
+            dx = (x - cx) / max_dist
+            dist = np.sqrt(dx * dx + dy * dy)
+            if dist <= radius:
+                continue
+            falloff = min((dist - radius) / (1.0 - radius + 1e-6), 1.0)
+            gain = 1.0 - strength * falloff * falloff
+            for c in range(channels):
+                image[y, x, c] = np.uint8(image[y, x, c] * gain + 0.5)
+
+
+@njit(f"void({RGB_IMAGE}, uint8[:, ::1])", parallel=True, cache=True)
+def apply_lut(image, lut):
+    """Map every channel through its own 256-entry lookup table"""
+    height, width, channels = image.shape
+    for y in prange(height):
+        for x in range(width):
+            for c in range(channels):
+                image[y, x, c] = lut[c, image[y, x, c]]
+
+
+@njit(f"void({RGB_IMAGE}, float32[::1])", parallel=True, cache=True)
+def scale_channels(image, gains):
+    """Multiply each channel by a gain, clipping to 255"""
+    height, width, channels = image.shape
+    for y in prange(height):
+        for x in range(width):
+            for c in range(channels):
+                value = image[y, x, c] * gains[c] + 0.5
+                image[y, x, c] = np.uint8(min(value, 255.0))
+
+
+@njit(f"void({RGB_IMAGE}, {RGB_IMAGE}, float32, int32)", parallel=True, cache=True)
+def unsharp_mask(image, blurred, amount, threshold):
+    """Add back amount * (image - blurred) where the difference exceeds threshold"""
+    height, width, channels = image.shape
+    for y in prange(height):
+        for x in range(width):
+            for c in range(channels):
+                original = np.int32(image[y, x, c])
+                diff = original - np.int32(blurred[y, x, c])
+                if abs(diff) < threshold:
+                    continue
+                value = original + amount * diff + 0.5
+                image[y, x, c] = np.uint8(min(max(value, 0.0), 255.0))
+
+
+@njit(f"void({RGB_IMAGE}, {RGB_IMAGE}, int32, int32, int32)", parallel=True, cache=True)
+def sigma_denoise(image, source, radius, sigma, top):
+    """
+    Edge-preserving noise reduction: average each pixel with the neighbours
+    within `radius` whose value is no more than `sigma` away from it.
+    `source` must be an untouched copy of the whole image; `image` holds its
+    rows top onwards.
+    """
+    height, width, channels = image.shape
+    source_height = source.shape[0]
+    for row in prange(height):
+        y = row + top
+        y0 = max(y - radius, 0)
+        y1 = min(y + radius + 1, source_height)
+        for x in range(width):
+            x0 = max(x - radius, 0)
+            x1 = min(x + radius + 1, width)
+            for c in range(channels):
+                center = np.int32(source[y, x, c])
+                total = 0
+                count = 0
+                for ny in range(y0, y1):
+                    for nx in range(x0, x1):
+                        value = np.int32(source[ny, nx, c])
+                        if abs(value - center) <= sigma:
+                            total += value
+                            count += 1
+                image[row, x, c] = np.uint8((total + count // 2) // count)
+
+
+def tone_curve_lut(points) -> np.ndarray:
+    """Build a (3, 256) lookup table from (input, output) control points"""
+    points = sorted(points)
+    xs = np.array([p[0] for p in points], dtype=np.float32)
+    ys = np.array([p[1] for p in points], dtype=np.float32)
+    curve = np.interp(np.arange(256, dtype=np.float32), xs, ys)
+    curve = np.clip(np.rint(curve), 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(np.stack([curve, curve, curve]))
+
+
+def white_balance_gains(temperature: float, tint: float) -> np.ndarray:
+    """
+    Per-channel gains for a temperature (-100 cool to 100 warm) and
+    tint (-100 green to 100 magenta) adjustment
+    """
+    warm = temperature / 100.0 * 0.3
+    magenta = tint / 100.0 * 0.3
+    return np.array(
+        [1.0 + warm + magenta / 2, 1.0 - magenta, 1.0 - warm + magenta / 2],
+        dtype=np.float32,
+    )
+
+
+def gray_world_gains(image: np.ndarray) -> np.ndarray:
+    """Gains that equalise the channel means (automatic white balance)"""
+    means = image.reshape(-1, image.shape[2]).mean(axis=0)
+    means = np.maximum(means, 1.0)
+    return (means.mean() / means).astype(np.float32)
@@ -0,0 +1,84 @@
+import io
+from typing import Callable, Tuple
+from PIL import ImageEnhance, ImageFilter
+from app.core.config import settings
+from app.schemas.photo_editing import PreviewParams
+from app.services import resampler
+from app.services.image_processor import ImageProcessor
+
+
+class PreviewCancelled(Exception):
+    """Raised when a newer state supersedes the preview being rendered"""
+
+
+class PreviewRenderer:
+    """
+    Renders downscaled previews of one uploaded image.
+
+    The image is decoded and downscaled once; every render starts from that
+    in-memory copy, so a slider update costs a few small filter passes and a
+    JPEG encode instead of a full-resolution decode.
+    """
+
+    def __init__(self, filename: str, max_dimension: int = None):
+        self.processor = ImageProcessor()
+        max_dimension = max_dimension or settings.PREVIEW_MAX_DIMENSION
+
+        info = self.processor.get_image_info(filename)
+        original_size = (info["width"], info["height"])
+        if max(original_size) > max_dimension:
+            image = self.processor._load_image(
+                filename,
+                resampler.draft_size(
+                    original_size, max_dimension, max_dimension, "fit"
+                ),
+            )
+            image = resampler.resize(image, max_dimension, max_dimension, "fit")
+        else:
+            image = self.processor._load_image(filename)
+        self.base = image.convert("RGB")
+        # Pixel-based parameters such as blur radius refer to the original
+        self.scale = self.base.width / original_size[0]
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.base.size
+
+    def render(self, params: PreviewParams, is_stale: Callable[[], bool]) -> bytes:
+        """
+        Apply params to the preview base and return JPEG bytes.
+
+        is_stale is checked between steps; once it returns True the render is
+        abandoned with PreviewCancelled.
+        """
+        steps = []
+        if params.brightness != 1.0:
+            steps.append(
+                lambda im: ImageEnhance.Brightness(im).enhance(params.brightness)
+            )
+        if params.contrast != 1.0:
+            steps.append(lambda im: ImageEnhance.Contrast(im).enhance(params.contrast))
+        if params.saturation != 1.0:
+            steps.append(lambda im: ImageEnhance.Color(im).enhance(params.saturation))
+        if params.blur:
+            radius = params.blur * self.scale
+            steps.append(lambda im: im.filter(ImageFilter.GaussianBlur(radius)))
+        if params.sharpen != 1.0:
+            steps.append(lambda im: ImageEnhance.Sharpness(im).enhance(params.sharpen))
+        if params.grayscale:
+            steps.append(lambda im: im.convert("L").convert("RGB"))
+        if params.sepia:
+            steps.append(self.processor._sepia)
+
+        image = self.base
+        for step in steps:
+            if is_stale():
+                raise PreviewCancelled()
+            image = step(image)
+
+        if is_stale():
+            raise PreviewCancelled()
+
+        buffer = io.BytesIO()
+        image.save(buffer, "JPEG", quality=settings.PREVIEW_JPEG_QUALITY)
+        return buffer.getvalue()
@@ -0,0 +1,115 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from PIL import Image
+
+ORIENTATION_TAG = 0x0112
+DATETIME_TAG = 0x0132
+EXIF_IFD_TAG = 0x8769
+DATETIME_ORIGINAL_TAG = 0x9003
+
+# EXIF orientations that rotate the image by 90 or 270 degrees
+SWAPS_AXES = {5, 6, 7, 8}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+CACHE_SIZE = 4096
+
+
+class _LRUCache:
+    """Small thread-safe LRU; probes run in the threadpool"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# (path, size, mtime) -> content hash, so unchanged files are not re-read
+_hashes = _LRUCache(CACHE_SIZE)
+# content hash -> probed metadata
+_metadata = _LRUCache(CACHE_SIZE)
+
+
+def orientation(image: Image.Image) -> int:
+    """EXIF orientation (1 to 8) read from the header; 1 when absent"""
+    value = image.getexif().get(ORIENTATION_TAG, 1)
+    return value if value in range(1, 9) else 1
+
+
+def _content_hash(path: str, stat: os.stat_result) -> str:
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    digest = _hashes.get(key)
+    if digest is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        _hashes.put(key, digest)
+    return digest
+
+
+def _parse_exif_datetime(value) -> Optional[str]:
+    """Convert EXIF 'YYYY:MM:DD HH:MM:SS' to ISO 8601; None if it does not parse"""
+    if not value:
+        return None
+    value = str(value).strip("\x00 ")
+    try:
+        return datetime.strptime(value, "%Y:%m:%d %H:%M:%S").isoformat()
+    except ValueError:
+        # Cameras write placeholders such as "0000:00:00 00:00:00"
+        return None
+
+
+def _read_header(path: str) -> dict:
+    # Image.open only parses the header; pixels are never decoded here
+    with Image.open(path) as image:
+        exif = image.getexif()
+        image_orientation = orientation(image)
+        captured_at = _parse_exif_datetime(
+            exif.get_ifd(EXIF_IFD_TAG).get(DATETIME_ORIGINAL_TAG)
+        ) or _parse_exif_datetime(exif.get(DATETIME_TAG))
+        width, height = image.size
+        if image_orientation in SWAPS_AXES:
+            width, height = height, width
+
+        return {
+            "width": width,
+            "height": height,
+            "format": image.format,
+            "mode": image.mode,
+            "orientation": image_orientation,
+            "has_icc_profile": bool(image.info.get("icc_profile")),
+            "captured_at": captured_at,
+        }
+
+
+def probe(path: str) -> dict:
+    """
+    Header-only metadata for an image file, cached per content hash.
+    width and height are as displayed, i.e. after EXIF orientation.
+    """
+    digest = _content_hash(path, os.stat(path))
+    info = _metadata.get(digest)
+    if info is None:
+        info = _read_header(path)
+        info["content_hash"] = digest
+        _metadata.put(digest, info)
+    return dict(info)
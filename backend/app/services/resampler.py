@@ -0,0 +1,109 @@
+from math import ceil
+from typing import Optional, Tuple
+from PIL import Image
+
+# Pillow first shrinks by an integer factor with reduce() while the image is
+# at least this many times larger than the target, then finishes with LANCZOS.
+REDUCING_GAP = 2.0
+
+RIGHT_ANGLE_TRANSPOSES = {
+    90: Image.Transpose.ROTATE_90,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_270,
+}
+
+FLIP_TRANSPOSES = {
+    "horizontal": Image.Transpose.FLIP_LEFT_RIGHT,
+    "vertical": Image.Transpose.FLIP_TOP_BOTTOM,
+}
+
+RESIZE_MODES = ("stretch", "fit", "fill")
+
+
+def _scaled_size(size: Tuple[int, int], scale: float) -> Tuple[int, int]:
+    """Scale a (width, height) pair, never going below one pixel"""
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def _center_box(
+    size: Tuple[int, int], target: Tuple[int, int]
+) -> Tuple[float, float, float, float]:
+    """Largest centered region of `size` with the aspect ratio of `target`"""
+    src_w, src_h = size
+    scale = max(target[0] / src_w, target[1] / src_h)
+    crop_w, crop_h = target[0] / scale, target[1] / scale
+    left, top = (src_w - crop_w) / 2, (src_h - crop_h) / 2
+    return left, top, left + crop_w, top + crop_h
+
+
+def draft_size(
+    size: Tuple[int, int], width: int, height: int, mode: str = "stretch"
+) -> Tuple[int, int]:
+    """
+    Size to request from draft(): REDUCING_GAP times the region resize()
+    samples from, as Image.thumbnail does. libjpeg's DCT scaling aliases, so
+    it must leave the last reduction to LANCZOS instead of producing the
+    output size by itself.
+    """
+    if mode == "fit":
+        scale = min(width / size[0], height / size[1])
+    elif mode == "fill":
+        scale = max(width / size[0], height / size[1])
+    else:
+        return ceil(width * REDUCING_GAP), ceil(height * REDUCING_GAP)
+    return ceil(size[0] * scale * REDUCING_GAP), ceil(size[1] * scale * REDUCING_GAP)
+
+
+def resize(
+    image: Image.Image, width: int, height: int, mode: str = "stretch"
+) -> Image.Image:
+    """
+    Resize an image that has not been decoded yet.
+
+    stretch: exactly width x height, ignoring the aspect ratio
+    fit:     largest size that fits inside width x height
+    fill:    exactly width x height, center-cropping the overflow
+    """
+    if mode not in RESIZE_MODES:
+        raise ValueError(f"Mode must be one of {RESIZE_MODES}")
+
+    box: Optional[Tuple[float, float, float, float]] = None
+    if mode == "fit":
+        scale = min(width / image.width, height / image.height)
+        width, height = _scaled_size(image.size, scale)
+
+    # For JPEGs this lets libjpeg decode at 1/2, 1/4 or 1/8 scale, keeping the
+    # result at least draft_size(). It is a no-op for other formats and for
+    # images that are already decoded.
+    image.draft(image.mode, draft_size(image.size, width, height, mode))
+
+    if mode == "fill":
+        # Computed after draft() because the decoded size may have shrunk
+        box = _center_box(image.size, (width, height))
+
+    if image.size == (width, height) and box is None:
+        return image.copy()
+
+    return image.resize(
+        (width, height),
+        Image.Resampling.LANCZOS,
+        box=box,
+        reducing_gap=REDUCING_GAP,
+    )
+
+
+def rotate(image: Image.Image, angle: float) -> Image.Image:
+    """Rotate counter-clockwise, losslessly when angle is a multiple of 90"""
+    normalized = angle % 360
+    if normalized == 0:
+        return image.copy()
+    if normalized in RIGHT_ANGLE_TRANSPOSES:
+        return image.transpose(RIGHT_ANGLE_TRANSPOSES[normalized])
+    return image.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
+
+
+def flip(image: Image.Image, direction: str) -> Image.Image:
+    """Mirror an image horizontally or vertically"""
+    if direction not in FLIP_TRANSPOSES:
+        raise ValueError("Direction must be 'horizontal' or 'vertical'")
+    return image.transpose(FLIP_TRANSPOSES[direction])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Compare the old single-pass resize/rotate path with app.services.resampler
+
+Run from the backend directory:
+    python benchmarks/bench_resample.py
+"""
+
+import io
+import os
+import sys
+import time
+
+from PIL import Image
+from synthetic import make_jpeg
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.services import resampler  # noqa: E402
+
+SOURCE_SIZE = (4000, 3000)
+REPEATS = 5
+
+
+def open_image(data: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(data))
+
+
+def legacy_resize(data, width, height):
+    return open_image(data).resize((width, height), Image.Resampling.LANCZOS)
+
+
+def fast_resize(data, width, height):
+    return resampler.resize(open_image(data), width, height)
+
+
+def legacy_rotate(data, angle):
+    return open_image(data).rotate(
+        angle, expand=True, resample=Image.Resampling.BICUBIC
+    )
+
+
+def fast_rotate(data, angle):
+    return resampler.rotate(open_image(data), angle)
+
+
+def timed(func, *args) -> float:
+    """Best wall time in milliseconds over REPEATS runs"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    data = make_jpeg(SOURCE_SIZE)
+    print(f"Source: {SOURCE_SIZE[0]}x{SOURCE_SIZE[1]} JPEG, {len(data) // 1024} KB")
+    print(f"{'case':<24}{'legacy ms':>12}{'fast ms':>12}{'speedup':>10}")
+
+    cases = [
+        ("resize 2x down", legacy_resize, fast_resize, (2000, 1500)),
+        ("resize 4x down", legacy_resize, fast_resize, (1000, 750)),
+        ("resize 8x down", legacy_resize, fast_resize, (500, 375)),
+        ("resize to 600x600", legacy_resize, fast_resize, (600, 600)),
+        ("rotate 90", legacy_rotate, fast_rotate, (90,)),
+        ("rotate 180", legacy_rotate, fast_rotate, (180,)),
+        ("rotate 15", legacy_rotate, fast_rotate, (15,)),
+    ]
+
+    for name, legacy, fast, args in cases:
+        legacy_ms = timed(legacy, data, *args)
+        fast_ms = timed(fast, data, *args)
+        print(
+            f"{name:<24}{legacy_ms:>12.1f}{fast_ms:>12.1f}{legacy_ms / fast_ms:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
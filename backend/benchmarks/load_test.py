@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator for the Photo Pass API
+
+Starts the app locally (or targets --url), uploads a corpus of synthetic
+images, then drives a weighted mix of operations at a fixed concurrency or
+request rate. Reports throughput, latency percentiles, error rate and server
+RSS over time.
+
+Requires httpx (see `make install-dev`). Run from the backend directory:
+    python benchmarks/load_test.py --mix sliders=70,resize=20,background=10 \\
+        --concurrency 8 --duration 60
+    python benchmarks/load_test.py --rate 20 --duration 60 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+from synthetic import make_jpeg
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+API_PREFIX = "/api/v1"
+BACKGROUND_COLORS = ["#ffffff", "#add8e6", "#d3d3d3", "#ffcccb"]
+
+
+# Each profile returns (endpoint, JSON body) for one request on `filename`
+def sliders(filename, rng):
+    endpoint = rng.choice(["brightness", "contrast", "saturation"])
+    return endpoint, {"filename": filename, "factor": round(rng.uniform(0.5, 2.0), 2)}
+
+
+def filters(filename, rng):
+    endpoint = rng.choice(["blur", "sharpen", "grayscale", "sepia"])
+    body = {"filename": filename}
+    if endpoint == "blur":
+        body["radius"] = rng.randint(1, 10)
+    elif endpoint == "sharpen":
+        body["factor"] = round(rng.uniform(0.5, 2.0), 2)
+    return endpoint, body
+
+
+def resize(filename, rng):
+    width = rng.choice([300, 600, 1200])
+    return "resize", {
+        "filename": filename,
+        "width": width,
+        "height": width,
+        "mode": rng.choice(["stretch", "fit", "fill"]),
+    }
+
+
+def rotate(filename, rng):
+    return "rotate", {"filename": filename, "angle": rng.choice([90, 180, 15])}
+
+
+def background(filename, rng):
+    return "change-background", {
+        "filename": filename,
+        "background_color": rng.choice(BACKGROUND_COLORS),
+    }
+
+
+PROFILES = {
+    "sliders": sliders,
+    "filters": filters,
+    "resize": resize,
+    "rotate": rotate,
+    "background": background,
+}
+
+
+def parse_mix(value):
+    """Parse 'sliders=70,resize=20,background=10' into a weight dict"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in PROFILES:
+            raise argparse.ArgumentTypeError(
+                f"Unknown profile {name!r}; choose from {sorted(PROFILES)}"
+            )
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_sizes(value):
+    """Parse '1200x900,3000x2000' into a list of (width, height)"""
+    return [tuple(int(n) for n in size.split("x")) for size in value.split(",")]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+def read_rss_mb(pid):
+    """Resident memory of pid and its children in MB (Linux /proc only)"""
+    if pid is None:
+        return None
+    pids = [pid]
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            pids += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    total_kb = 0
+    for p in pids:
+        try:
+            with open(f"/proc/{p}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kb / 1024, 1) if total_kb else None
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(int)
+        self.window = []
+        self.window_errors = 0
+        self.timeline = []
+
+    def record(self, operation, latency, status):
+        """status is the HTTP status code, or an exception name"""
+        self.latencies[operation].append(latency)
+        self.window.append(latency)
+        self.statuses[str(status)] += 1
+        if status != 200:
+            self.errors[operation] += 1
+            self.window_errors += 1
+
+    def snapshot(self, elapsed, interval, rss_mb):
+        window = sorted(self.window)
+        point = {
+            "elapsed_s": round(elapsed, 1),
+            "rps": round(len(window) / interval, 1),
+            "p50_ms": round(percentile(window, 50) * 1000, 1),
+            "p95_ms": round(percentile(window, 95) * 1000, 1),
+            "errors": self.window_errors,
+            "rss_mb": rss_mb,
+        }
+        self.timeline.append(point)
+        self.window = []
+        self.window_errors = 0
+        return point
+
+    def summary(self, duration):
+        everything = sorted(v for values in self.latencies.values() for v in values)
+        total = len(everything)
+        errors = sum(self.errors.values())
+        per_operation = {}
+        for operation, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            per_operation[operation] = {
+                "count": len(values),
+                "errors": self.errors[operation],
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+            }
+        rss = [p["rss_mb"] for p in self.timeline if p["rss_mb"] is not None]
+        return {
+            "requests": total,
+            "duration_s": round(duration, 1),
+            "throughput_rps": round(total / duration, 2) if duration else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "p50_ms": round(percentile(everything, 50) * 1000, 1),
+            "p95_ms": round(percentile(everything, 95) * 1000, 1),
+            "p99_ms": round(percentile(everything, 99) * 1000, 1),
+            "peak_rss_mb": max(rss) if rss else None,
+            "statuses": dict(self.statuses),
+            "operations": per_operation,
+            "timeline": self.timeline,
+        }
+
+
+class LoadTest:
+    def __init__(self, args, base_url, server_pid):
+        self.args = args
+        self.base_url = base_url
+        self.server_pid = server_pid
+        self.rng = random.Random(args.seed)
+        self.stats = Stats()
+        self.filenames = []
+        names, weights = zip(*args.mix.items())
+        self.profile_names = names
+        self.profile_weights = weights
+
+    async def upload_corpus(self, client):
+        sizes = self.args.sizes
+        for i in range(self.args.images):
+            data = make_jpeg(sizes[i % len(sizes)], seed=i)
+            response = await client.post(
+                f"{API_PREFIX}/upload",
+                files={"file": (f"load-{i}.jpg", data, "image/jpeg")},
+            )
+            response.raise_for_status()
+            self.filenames.append(response.json()["filename"])
+        print(f"Uploaded {len(self.filenames)} images ({self.args.sizes})")
+
+    async def delete_corpus(self, client):
+        """Delete the uploaded corpus so runs against --url leave no uploads behind"""
+        failed = 0
+        for filename in self.filenames:
+            try:
+                response = await client.delete(f"{API_PREFIX}/delete/{filename}")
+                failed += response.status_code != 200
+            except httpx.HTTPError:
+                failed += 1
+        print(f"\nDeleted {len(self.filenames) - failed}/{len(self.filenames)} uploads")
+        if self.server_pid is None:
+            print("Processed outputs stay in the server's PROCESSED_DIR")
+
+    async def one_request(self, client):
+        name = self.rng.choices(self.profile_names, self.profile_weights)[0]
+        endpoint, body = PROFILES[name](self.rng.choice(self.filenames), self.rng)
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"{API_PREFIX}/{endpoint}", json=body)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        self.stats.record(endpoint, time.perf_counter() - start, status)
+
+    async def closed_loop(self, client, deadline):
+        """Keep `concurrency` requests in flight"""
+
+        async def worker():
+            while time.monotonic() < deadline:
+                await self.one_request(client)
+
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+
+    async def open_loop(self, client, deadline):
+        """Start requests at `rate` per second (Poisson arrivals)"""
+        in_flight = set()
+        while time.monotonic() < deadline:
+            task = asyncio.create_task(self.one_request(client))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            await asyncio.sleep(self.rng.expovariate(self.args.rate))
+        await asyncio.gather(*in_flight)
+
+    async def report(self, start):
+        interval = self.args.interval
+        print(
+            f"{'t(s)':>6}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}{'rss MB':>9}"
+        )
+        while True:
+            await asyncio.sleep(interval)
+            point = self.stats.snapshot(
+                time.monotonic() - start, interval, read_rss_mb(self.server_pid)
+            )
+            print(
+                f"{point['elapsed_s']:>6}{point['rps']:>8}{point['p50_ms']:>10}"
+                f"{point['p95_ms']:>10}{point['errors']:>8}"
+                f"{point['rss_mb'] if point['rss_mb'] is not None else 'n/a':>9}"
+            )
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.args.timeout, limits=limits
+        ) as client:
+            try:
+                await self.upload_corpus(client)
+
+                start = time.monotonic()
+                deadline = start + self.args.duration
+                reporter = asyncio.create_task(self.report(start))
+                if self.args.rate:
+                    await self.open_loop(client, deadline)
+                else:
+                    await self.closed_loop(client, deadline)
+                reporter.cancel()
+
+                return self.stats.summary(time.monotonic() - start)
+            finally:
+                await self.delete_corpus(client)
+
+
+def start_server(port, workdir):
+    """Launch uvicorn with upload/processed dirs inside workdir"""
+    env = dict(
+        os.environ,
+        UPLOAD_DIR=os.path.join(workdir, "uploads"),
+        PROCESSED_DIR=os.path.join(workdir, "processed"),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        if process.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            if httpx.get(f"{url}/health").status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy within 60s")
+
+
+def print_summary(summary):
+    print("\nSummary")
+    print(f"  requests     {summary['requests']} in {summary['duration_s']}s")
+    print(f"  throughput   {summary['throughput_rps']} req/s")
+    print(f"  error rate   {summary['error_rate'] * 100:.2f}%")
+    print(
+        f"  latency      p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, "
+        f"p99 {summary['p99_ms']} ms"
+    )
+    if summary["peak_rss_mb"] is None:
+        print("  peak RSS     unavailable (only measured for a server started here)")
+    else:
+        print(f"  peak RSS     {summary['peak_rss_mb']} MB")
+    print(f"  statuses     {summary['statuses']}")
+    print(
+        f"\n  {'operation':<20}{'count':>7}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+    )
+    for name, op in summary["operations"].items():
+        print(
+            f"  {name:<20}{op['count']:>7}{op['errors']:>8}"
+            f"{op['p50_ms']:>9}{op['p95_ms']:>9}{op['p99_ms']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--url", help="Target an already running server instead of starting one"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("sliders=70,resize=20,background=10"),
+        help=f"Weighted profiles, choose from {sorted(PROFILES)}",
+    )
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=4, help="Requests in flight")
+    load.add_argument("--rate", type=float, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds")
+    parser.add_argument("--images", type=int, default=8, help="Corpus size")
+    parser.add_argument(
+        "--sizes", type=parse_sizes, default=parse_sizes("1200x900,3000x2000")
+    )
+    parser.add_argument("--interval", type=float, default=5, help="Report interval")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write the summary and timeline here")
+    args = parser.parse_args()
+
+    server = None
+    workdir = tempfile.TemporaryDirectory(prefix="photo-pass-load-")
+    try:
+        if args.url:
+            base_url, server_pid = args.url.rstrip("/"), None
+            print("Server RSS is unavailable with --url; only latency is measured")
+        else:
+            server, base_url = start_server(args.port, workdir.name)
+            server_pid = server.pid
+            print(f"Started server pid {server_pid} at {base_url}")
+
+        summary = asyncio.run(LoadTest(args, base_url, server_pid).run())
+        print_summary(summary)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(summary, f, indent=2)
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGINT)
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""Synthetic test images shared by the benchmark scripts"""
+
+import io
+
+import numpy as np
+from PIL import Image
+
+
+def make_jpeg(size, seed: int = 0) -> bytes:
+    """Noisy gradient JPEG, roughly as hard to compress as a phone photo"""
+    width, height = size
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1)
+    pixels += rng.integers(0, 40, (height, width, 3))
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(
+        buffer, "JPEG", quality=90
+    )
+    return buffer.getvalue()
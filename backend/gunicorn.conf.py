@@ -0,0 +1,97 @@
+"""
+Production server: gunicorn master with pre-forked uvicorn workers
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The master imports the app (numba kernels compile at import), loads the
+rembg model and freezes the GC heap, then forks workers. Workers share those
+pages copy-on-write instead of each loading its own copy. Workers restart
+after MAX_REQUESTS requests to cap heap fragmentation.
+
+Environment overrides: WEB_CONCURRENCY, MAX_REQUESTS, MAX_REQUESTS_JITTER,
+PORT, TIMEOUT, GRACEFUL_TIMEOUT.
+"""
+
+import gc
+import math
+import os
+import sys
+
+
+def cpu_limit() -> float:
+    """CPUs available to this container: cgroup quota, else affinity mask"""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return float(len(os.sched_getaffinity(0)))
+
+
+cpus = cpu_limit()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# Image work is CPU bound, so more workers than CPUs only adds memory
+workers = int(os.environ.get("WEB_CONCURRENCY", max(1, math.floor(cpus))))
+preload_app = True
+
+max_requests = int(os.environ.get("MAX_REQUESTS", 1000))
+# Stagger restarts so workers do not all recycle at once
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", max_requests // 10))
+timeout = int(os.environ.get("TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+
+if os.path.isdir("/dev/shm"):
+    # Keep worker heartbeats off the (possibly slow) container filesystem
+    worker_tmp_dir = "/dev/shm"
+
+# Split the CPUs between workers instead of every worker starting a thread
+# per core. Both variables must be set before numba/onnxruntime are imported.
+threads_per_worker = str(max(1, math.floor(cpus / workers)))
+os.environ.setdefault("NUMBA_NUM_THREADS", threads_per_worker)
+# rembg sizes onnxruntime's thread pools from this. With one thread the
+# session creates no pool, which keeps it safe to share across fork().
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+
+
+def on_starting(server):
+    """Runs in the master after the app is imported, before any fork"""
+    from app.services.image_processor import get_rembg_session
+
+    get_rembg_session()
+    # Move everything loaded so far out of the GC's reach, so collections in
+    # workers do not touch (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+    server.log.info(
+        "Preloaded app and models; starting %s workers (CPU limit %.2f)",
+        workers,
+        cpus,
+    )
+
+
+def worker_exit(server, worker):
+    """
+    Runs in the worker after it has stopped serving. onnxruntime's C++ static
+    destructors abort in forked children, so skip interpreter teardown and
+    exit directly with the status gunicorn was about to use.
+    """
+    exc = sys.exc_info()[1]
+    code = exc.code if isinstance(exc, SystemExit) else 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code if isinstance(code, int) else 0 if code is None else 1)
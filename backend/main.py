@@ -1,6 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import photo_editing
+from app.routers import live_preview, photo_editing
 from app.core.config import settings
 
 app = FastAPI(
@@ -22,6 +22,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(photo_editing.router, prefix="/api/v1", tags=["photo-editing"])
+app.include_router(live_preview.router, prefix="/api/v1", tags=["live-preview"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services import kernels
+from app.services.image_processor import STRIP_ROWS, ImageProcessor
+from app.services.jobs import CancellationToken, ProcessingCancelled
+
+
+@pytest.fixture
+def upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROCESSED_DIR", str(tmp_path))
+    pixels = np.random.default_rng(0).integers(0, 256, (STRIP_ROWS * 3, 32, 3))
+    Image.fromarray(pixels.astype(np.uint8)).save(tmp_path / "photo.png")
+    return "photo.png"
+
+
+def test_kernel_filter_stops_between_strips(upload, monkeypatch):
+    token = CancellationToken()
+    calls = []
+
+    def cancel_after_first_strip(*args):
+        calls.append(args)
+        token.cancel()
+
+    monkeypatch.setattr(kernels, "sigma_denoise", cancel_after_first_strip)
+    with pytest.raises(ProcessingCancelled):
+        ImageProcessor(cancel_token=token).reduce_noise(upload, 2, 20)
+    assert len(calls) == 1
+
+
+def test_strips_cover_every_row(upload, tmp_path, monkeypatch):
+    saved = []
+    monkeypatch.setattr(
+        ImageProcessor, "_save_image", lambda self, image, path: saved.append(image)
+    )
+    ImageProcessor().apply_vignette(upload, 0.8, 0.2)
+
+    expected = np.array(Image.open(tmp_path / upload))
+    kernels.vignette(expected, np.float32(0.8), np.float32(0.2), 0, len(expected))
+    assert np.array_equal(np.asarray(saved[0]), expected)
+
+
+def test_images_info_reports_missing_and_invalid(upload, tmp_path):
+    (tmp_path / "broken.jpg").write_bytes(b"not an image")
+    info = ImageProcessor().get_images_info([upload, "broken.jpg", "gone.jpg"])
+    assert [image["filename"] for image in info["images"]] == [upload]
+    assert info["missing"] == ["gone.jpg"]
+    assert info["invalid"] == ["broken.jpg"]
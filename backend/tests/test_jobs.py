@@ -0,0 +1,99 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from app.routers import photo_editing
+from app.services import jobs
+from app.services.jobs import ProcessingCancelled
+
+
+class FakeRequest:
+    """Stands in for starlette's Request; only is_disconnected() is used"""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def blocking_work(started: threading.Event, checkpoint):
+    """Work that runs until cancelled, checking in every 10 ms (5 s at most)"""
+    started.set()
+    for _ in range(500):
+        checkpoint()
+        time.sleep(0.01)
+    return "finished"
+
+
+async def disconnect_once_started(request: FakeRequest, started: threading.Event):
+    assert await asyncio.to_thread(started.wait, 5)
+    request.disconnected = True
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_work_and_frees_slot():
+    request = FakeRequest()
+    started = threading.Event()
+    free_slots = jobs._slots._value
+    before = jobs.get_stats()
+
+    job = asyncio.create_task(
+        jobs.run_cancellable(request, lambda token: blocking_work(started, token.check))
+    )
+    assert await asyncio.to_thread(started.wait, 5)
+    assert jobs._slots._value == free_slots - 1
+    assert jobs.get_stats()["active"] == before["active"] + 1
+
+    request.disconnected = True
+    with pytest.raises(ProcessingCancelled):
+        await asyncio.wait_for(job, 5)
+
+    stats = jobs.get_stats()
+    assert jobs._slots._value == free_slots
+    assert stats["cancelled"] == before["cancelled"] + 1
+    assert stats["active"] == before["active"]
+    assert stats["completed"] == before["completed"]
+
+
+@pytest.mark.asyncio
+async def test_failing_work_is_counted_and_frees_slot():
+    free_slots = jobs._slots._value
+    before = jobs.get_stats()
+
+    def work(token):
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        await jobs.run_cancellable(FakeRequest(), work)
+
+    stats = jobs.get_stats()
+    assert jobs._slots._value == free_slots
+    assert stats["failed"] == before["failed"] + 1
+    assert stats["cancelled"] == before["cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_completed_work_returns_result():
+    before = jobs.get_stats()
+    assert await jobs.run_cancellable(FakeRequest(), lambda token: 42) == 42
+    stats = jobs.get_stats()
+    assert stats["completed"] == before["completed"] + 1
+    assert stats["pid"] == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_disconnected_client_gets_499():
+    request = FakeRequest()
+    started = threading.Event()
+
+    def operation(processor, *args):
+        return blocking_work(started, processor._checkpoint)
+
+    disconnect = asyncio.create_task(disconnect_once_started(request, started))
+    response = await asyncio.wait_for(photo_editing._process(request, operation), 5)
+    await disconnect
+    assert response.status_code == photo_editing.CLIENT_CLOSED_REQUEST
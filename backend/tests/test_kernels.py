@@ -0,0 +1,80 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numba
+import numpy as np
+
+from app.services import kernels
+
+
+def random_image(seed=0, size=(48, 64)) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, (*size, 3), dtype=np.uint8)
+
+
+def test_identity_lut_is_a_no_op():
+    image = random_image()
+    expected = image.copy()
+    kernels.apply_lut(image, kernels.tone_curve_lut([(0, 0), (255, 255)]))
+    assert np.array_equal(image, expected)
+
+
+def test_tone_curve_lut_interpolates_points():
+    lut = kernels.tone_curve_lut([(0, 255), (255, 0)])
+    assert lut.shape == (3, 256)
+    assert lut[0, 0] == 255 and lut[0, 255] == 0 and lut[2, 128] == 127
+
+
+def test_sigma_denoise_keeps_flat_image():
+    image = np.full((32, 32, 3), 137, dtype=np.uint8)
+    kernels.sigma_denoise(image, image.copy(), 3, 20, 0)
+    assert np.all(image == 137)
+
+
+def test_sigma_denoise_preserves_edges():
+    image = np.zeros((16, 16, 3), dtype=np.uint8)
+    image[:, 8:] = 200
+    expected = image.copy()
+    kernels.sigma_denoise(image, image.copy(), 2, 20, 0)
+    assert np.array_equal(image, expected)
+
+
+def test_strips_match_whole_image():
+    whole = random_image(size=(50, 40))
+    strips = whole.copy()
+    source = whole.copy()
+    kernels.sigma_denoise(whole, source, 3, 60, 0)
+    kernels.vignette(whole, np.float32(0.8), np.float32(0.2), 0, 50)
+    for top in range(0, 50, 16):
+        strip = strips[top : top + 16]
+        kernels.sigma_denoise(strip, source, 3, 60, top)
+        kernels.vignette(strip, np.float32(0.8), np.float32(0.2), top, 50)
+    assert np.array_equal(whole, strips)
+
+
+def test_unsharp_mask_skips_differences_below_threshold():
+    image = np.full((8, 8, 3), 100, dtype=np.uint8)
+    image[0, 0] = 104
+    image[1, 1] = 140
+    blurred = np.full_like(image, 100)
+    kernels.unsharp_mask(image, blurred, np.float32(1.0), 5)
+    assert tuple(image[0, 0]) == (104, 104, 104)
+    assert tuple(image[1, 1]) == (180, 180, 180)
+    assert np.all(image[2:] == 100)
+
+
+def test_scale_channels_clips():
+    image = np.full((4, 4, 3), 200, dtype=np.uint8)
+    kernels.scale_channels(image, np.array([2.0, 1.0, 0.5], dtype=np.float32))
+    assert tuple(image[0, 0]) == (255, 200, 100)
+
+
+def test_kernels_run_concurrently_on_threadsafe_layer():
+    images = [random_image(seed) for seed in range(8)]
+
+    def work(image):
+        for _ in range(5):
+            kernels.vignette(image, np.float32(0.5), np.float32(0.3), 0, 48)
+
+    with ThreadPoolExecutor(len(images)) as pool:
+        list(pool.map(work, images))
+    assert numba.threading_layer() == "tbb"
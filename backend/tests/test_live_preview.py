@@ -0,0 +1,71 @@
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.core.config import settings
+from app.services.live_preview import PreviewRenderer
+from main import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+    Image.new("RGB", (64, 48), "red").save(tmp_path / "photo.jpg")
+    return TestClient(app)
+
+
+def test_preview_renders_frame(client):
+    with client.websocket_connect("/api/v1/preview/photo.jpg") as websocket:
+        websocket.send_json({"seq": 1, "brightness": 1.5})
+        assert websocket.receive_json() == {"seq": 1, "width": 64, "height": 48}
+        assert websocket.receive_bytes()[:2] == b"\xff\xd8"
+
+
+@pytest.mark.parametrize(
+    "filename, reason",
+    [("gone.jpg", "Image not found"), ("bad.jpg", "Not a readable image")],
+)
+def test_unusable_image_closes_with_policy_violation(
+    client, tmp_path, filename, reason
+):
+    (tmp_path / "bad.jpg").write_bytes(b"not an image")
+    with client.websocket_connect(f"/api/v1/preview/{filename}") as websocket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            websocket.receive_json()
+    assert closed.value.code == 1008
+    assert closed.value.reason == reason
+
+
+@pytest.mark.parametrize(
+    "send",
+    [
+        lambda ws: ws.send_text("not json"),
+        lambda ws: ws.send_bytes(b"\x00\x01"),
+        lambda ws: ws.send_json({"seq": 1, "brightness": "very"}),
+    ],
+)
+def test_malformed_messages_get_error_reply(client, send):
+    with client.websocket_connect("/api/v1/preview/photo.jpg") as websocket:
+        send(websocket)
+        assert "error" in websocket.receive_json()
+        # The connection stays usable
+        websocket.send_json({"seq": 2})
+        assert websocket.receive_json()["seq"] == 2
+
+
+def test_failed_render_reports_error_and_keeps_rendering(client, monkeypatch):
+    render = PreviewRenderer.render
+
+    def fail_once(self, params, is_stale):
+        if params.seq == 1:
+            raise RuntimeError("render failed")
+        return render(self, params, is_stale)
+
+    monkeypatch.setattr(PreviewRenderer, "render", fail_once)
+    with client.websocket_connect("/api/v1/preview/photo.jpg") as websocket:
+        websocket.send_json({"seq": 1})
+        assert websocket.receive_json() == {"seq": 1, "error": "render failed"}
+        websocket.send_json({"seq": 2})
+        assert websocket.receive_json()["seq"] == 2
+        assert websocket.receive_bytes()[:2] == b"\xff\xd8"
@@ -0,0 +1,83 @@
+import shutil
+
+import pytest
+from PIL import Image
+
+from app.services import metadata
+
+
+def save_jpeg(path, size=(40, 20), orientation=None, original=None, datetime=None):
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[metadata.ORIENTATION_TAG] = orientation
+    if datetime is not None:
+        exif[metadata.DATETIME_TAG] = datetime
+    if original is not None:
+        exif.get_ifd(metadata.EXIF_IFD_TAG)[metadata.DATETIME_ORIGINAL_TAG] = original
+    Image.new("RGB", size, "blue").save(path, "JPEG", exif=exif)
+    return str(path)
+
+
+@pytest.mark.parametrize("orientation", [5, 6, 7, 8])
+def test_rotated_orientations_swap_dimensions(tmp_path, orientation):
+    info = metadata.probe(save_jpeg(tmp_path / "a.jpg", orientation=orientation))
+    assert (info["width"], info["height"]) == (20, 40)
+    assert info["orientation"] == orientation
+
+
+@pytest.mark.parametrize("orientation", [None, 1, 2, 3, 4])
+def test_upright_orientations_keep_dimensions(tmp_path, orientation):
+    info = metadata.probe(save_jpeg(tmp_path / "a.jpg", orientation=orientation))
+    assert (info["width"], info["height"]) == (40, 20)
+    assert info["orientation"] == (orientation or 1)
+
+
+@pytest.mark.parametrize(
+    "tags, expected",
+    [
+        ({"original": "2024:05:01 12:30:00"}, "2024-05-01T12:30:00"),
+        (
+            {"original": "2024:05:01 12:30:00", "datetime": "2020:01:01 00:00:00"},
+            "2024-05-01T12:30:00",
+        ),
+        ({"datetime": "2020:01:02 03:04:05"}, "2020-01-02T03:04:05"),
+        ({"original": "sometime in May"}, None),
+        ({"original": "0000:00:00 00:00:00"}, None),
+        (
+            {"original": "sometime in May", "datetime": "2020:01:02 03:04:05"},
+            "2020-01-02T03:04:05",
+        ),
+        ({}, None),
+    ],
+)
+def test_captured_at(tmp_path, tags, expected):
+    info = metadata.probe(save_jpeg(tmp_path / "a.jpg", **tags))
+    assert info["captured_at"] == expected
+
+
+def test_probe_reads_header_once_per_content(tmp_path, monkeypatch):
+    calls = []
+    read_header = metadata._read_header
+
+    def counting_read_header(path):
+        calls.append(path)
+        return read_header(path)
+
+    monkeypatch.setattr(metadata, "_read_header", counting_read_header)
+    path = save_jpeg(tmp_path / "a.jpg", size=(31, 17))
+    first = metadata.probe(path)
+    assert metadata.probe(path) == first
+    # Same bytes under another name hit the content-hash cache too
+    copy = shutil.copy(path, tmp_path / "b.jpg")
+    assert metadata.probe(copy)["content_hash"] == first["content_hash"]
+    assert len(calls) == 1
+
+    save_jpeg(path, size=(17, 31))
+    assert metadata.probe(path)["width"] == 17
+    assert len(calls) == 2
+
+
+def test_probe_returns_a_copy(tmp_path):
+    path = save_jpeg(tmp_path / "a.jpg", size=(23, 19))
+    metadata.probe(path)["width"] = 0
+    assert metadata.probe(path)["width"] == 23
@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.services import resampler
+
+
+def make_jpeg(size) -> Image.Image:
+    """Open (but do not decode) a noisy JPEG, like an upload"""
+    width, height = size
+    pixels = np.random.default_rng(0).integers(0, 256, (height, width, 3))
+    buffer = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8)).save(buffer, "JPEG", quality=90)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+def test_draft_size_keeps_reducing_gap_headroom():
+    # A 4x downscale may be decoded at 1/2 scale, leaving 2x for LANCZOS
+    assert resampler.draft_size((4000, 3000), 1000, 750) == (2000, 1500)
+    assert resampler.draft_size((4000, 3000), 1000, 1000, "fit") == (2000, 1500)
+    assert resampler.draft_size((4000, 3000), 500, 500, "fill") == (1334, 1000)
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [("stretch", (300, 200)), ("fit", (267, 200)), ("fill", (300, 200))],
+)
+def test_resize_output_size(mode, expected):
+    image = resampler.resize(make_jpeg((1600, 1200)), 300, 200, mode)
+    assert image.size == expected
+
+
+def test_fit_keeps_aspect_ratio_of_portrait():
+    image = resampler.resize(make_jpeg((1200, 1600)), 300, 300, "fit")
+    assert image.size == (225, 300)
+
+
+def test_small_downscale_is_resampled_not_drafted():
+    # A 2x downscale must not be left to libjpeg's DCT scaling alone
+    expected = make_jpeg((800, 600)).resize((400, 300), Image.Resampling.LANCZOS)
+    image = resampler.resize(make_jpeg((800, 600)), 400, 300)
+    assert np.array_equal(np.asarray(image), np.asarray(expected))
+
+
+def test_resize_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        resampler.resize(make_jpeg((64, 64)), 32, 32, "crop")
+
+
+@pytest.mark.parametrize(
+    "angle, transpose",
+    [
+        (90, Image.Transpose.ROTATE_90),
+        (-90, Image.Transpose.ROTATE_270),
+        (180, Image.Transpose.ROTATE_180),
+        (630, Image.Transpose.ROTATE_270),
+    ],
+)
+def test_right_angle_rotate_is_lossless(angle, transpose):
+    source = make_jpeg((64, 48))
+    source.load()
+    image = resampler.rotate(source, angle)
+    assert np.array_equal(np.asarray(image), np.asarray(source.transpose(transpose)))
+
+
+def test_full_turn_returns_copy():
+    source = make_jpeg((64, 48))
+    image = resampler.rotate(source, 360)
+    assert image is not source
+    assert np.array_equal(np.asarray(image), np.asarray(source))
+
+
+def test_arbitrary_angle_expands_canvas():
+    image = resampler.rotate(make_jpeg((64, 48)), 15)
+    assert image.width > 64 and image.height > 48
@@ -1,6 +1,6 @@
 "use client";
 
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Button } from "@/components/ui/button";
 import { Slider } from "@/components/ui/slider";
@@ -31,6 +31,7 @@ import {
     useApplySepia,
     useResizeImage,
 } from "@/hooks/use-photo-api";
+import { PreviewParams, PreviewSocket } from "@/lib/preview-socket";
 import { toast } from "sonner";
 
 interface PhotoFiltersProps {
@@ -80,6 +81,36 @@ export function PhotoFilters({
     const sepiaMutation = useApplySepia();
     const resizeMutation = useResizeImage();
 
+    // While a slider is dragged, downscaled previews stream over a
+    // WebSocket; the full-size image is processed once it is released
+    const previewSocket = useRef<PreviewSocket | null>(null);
+    const previewActive = useRef(false);
+
+    useEffect(() => {
+        if (!uploadedFilename) {
+            return;
+        }
+        const socket = new PreviewSocket(
+            uploadedFilename,
+            (blob) => {
+                if (previewActive.current) {
+                    onImageProcessed(blob);
+                }
+            },
+            (message) => console.error("Live preview failed:", message)
+        );
+        previewSocket.current = socket;
+        return () => {
+            socket.close();
+            previewSocket.current = null;
+        };
+    }, [uploadedFilename, onImageProcessed]);
+
+    const sendPreview = (params: PreviewParams) => {
+        previewActive.current = true;
+        previewSocket.current?.send(params);
+    };
+
     // Check if any processing is happening
     const isAnyProcessing =
         isProcessing ||
@@ -101,6 +132,8 @@ export function PhotoFilters({
 
         const newValue = value[0];
         setBrightness(newValue);
+        // Frames still in flight must not replace the full-size result
+        previewActive.current = false;
 
         try {
             const result = await brightnessMutation.mutateAsync({
@@ -126,6 +159,8 @@ export function PhotoFilters({
 
         const newValue = value[0];
         setContrast(newValue);
+        // Frames still in flight must not replace the full-size result
+        previewActive.current = false;
 
         try {
             const result = await contrastMutation.mutateAsync({
@@ -151,6 +186,8 @@ export function PhotoFilters({
 
         const newValue = value[0];
         setSaturation(newValue);
+        // Frames still in flight must not replace the full-size result
+        previewActive.current = false;
 
         try {
             const result = await saturationMutation.mutateAsync({
@@ -336,7 +373,11 @@ export function PhotoFilters({
                     <div className="p-2 bg-gray-50 rounded-lg border border-gray-200">
                         <Slider
                             value={[brightness]}
-                            onValueChange={handleBrightnessChange}
+                            onValueChange={(value) => {
+                                setBrightness(value[0]);
+                                sendPreview({ brightness: value[0] });
+                            }}
+                            onValueCommit={handleBrightnessChange}
                             min={0.1}
                             max={3.0}
                             step={0.1}
@@ -373,7 +414,11 @@ export function PhotoFilters({
                     <div className="p-2 bg-gray-50 rounded-lg border border-gray-200">
                         <Slider
                             value={[contrast]}
-                            onValueChange={handleContrastChange}
+                            onValueChange={(value) => {
+                                setContrast(value[0]);
+                                sendPreview({ contrast: value[0] });
+                            }}
+                            onValueCommit={handleContrastChange}
                             min={0.1}
                             max={3.0}
                             step={0.1}
@@ -411,7 +456,11 @@ export function PhotoFilters({
                     <div className="p-2 bg-gray-50 rounded-lg border border-gray-200">
                         <Slider
                             value={[saturation]}
-                            onValueChange={handleSaturationChange}
+                            onValueChange={(value) => {
+                                setSaturation(value[0]);
+                                sendPreview({ saturation: value[0] });
+                            }}
+                            onValueCommit={handleSaturationChange}
                             min={0.0}
                             max={3.0}
                             step={0.1}
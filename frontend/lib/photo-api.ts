@@ -42,6 +42,7 @@ export interface ResizeRequest {
     filename: string;
     width: number;
     height: number;
+    mode?: "stretch" | "fit" | "fill";
 }
 
 export interface CropRequest {
@@ -68,6 +69,17 @@ export interface ImageInfo {
     size_mb: number;
 }
 
+export interface ImageMetadata extends ImageInfo {
+    width: number;
+    height: number;
+    format: string;
+    mode: string;
+    orientation: number;
+    has_icc_profile: boolean;
+    captured_at: string | null;
+    content_hash: string;
+}
+
 // Photo editing API functions
 export const photoApi = {
     // Upload image
@@ -208,6 +220,18 @@ export const photoApi = {
         return response.data;
     },
 
+    // Header metadata for many images in one call
+    getImagesInfo: async (
+        filenames: string[]
+    ): Promise<{
+        images: ImageMetadata[];
+        missing: string[];
+        invalid: string[];
+    }> => {
+        const response = await api.post("/api/v1/info", { filenames });
+        return response.data;
+    },
+
     // Delete image
     deleteImage: async (filename: string): Promise<{ message: string }> => {
         const response = await api.delete(`/api/v1/delete/${filename}`);
@@ -0,0 +1,75 @@
+import { api } from "./api";
+
+// Parameters streamed to /api/v1/preview/{filename}
+export interface PreviewParams {
+    brightness?: number;
+    contrast?: number;
+    saturation?: number;
+    blur?: number;
+    sharpen?: number;
+    grayscale?: boolean;
+    sepia?: boolean;
+}
+
+interface FrameHeader {
+    seq: number;
+    width: number;
+    height: number;
+}
+
+// Live preview over a single WebSocket. The server only renders the newest
+// parameters, so callers can send on every slider change without throttling.
+export class PreviewSocket {
+    private socket: WebSocket;
+    private seq = 0;
+    private pendingHeader: FrameHeader | null = null;
+
+    constructor(
+        filename: string,
+        onFrame: (blob: Blob, header: FrameHeader) => void,
+        onError?: (message: string) => void
+    ) {
+        const baseUrl = (api.defaults.baseURL || "").replace(/^http/, "ws");
+        this.socket = new WebSocket(
+            `${baseUrl}/api/v1/preview/${encodeURIComponent(filename)}`
+        );
+        this.socket.binaryType = "blob";
+
+        this.socket.onmessage = (event) => {
+            if (typeof event.data === "string") {
+                const message = JSON.parse(event.data);
+                if (message.error) {
+                    onError?.(message.error);
+                } else {
+                    this.pendingHeader = message;
+                }
+                return;
+            }
+
+            // Frames arrive in order, each preceded by its JSON header
+            const header = this.pendingHeader;
+            this.pendingHeader = null;
+            if (header) {
+                onFrame(event.data as Blob, header);
+            }
+        };
+
+        this.socket.onclose = (event) => {
+            if (event.code === 1008) {
+                onError?.(event.reason || "Preview unavailable");
+            }
+        };
+    }
+
+    send(params: PreviewParams) {
+        if (this.socket.readyState !== WebSocket.OPEN) {
+            return;
+        }
+        this.seq += 1;
+        this.socket.send(JSON.stringify({ ...params, seq: this.seq }));
+    }
+
+    close() {
+        this.socket.close();
+    }
+}